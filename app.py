@@ -1,10 +1,21 @@
 import streamlit as st
+import hashlib
 import os
-import tempfile
-from tailor import tailor_resume_file
+from resume_loader import load_resume_bytes
+from tailor import tailor_resume_text
 
 st.set_page_config(page_title="Resume Tailor", layout="wide")
 
+
+@st.cache_data(show_spinner=False)
+def load_resume_cached(file_hash: str, suffix: str, _data: bytes) -> str:
+    """
+    Extract resume text once per distinct upload. Streamlit skips hashing
+    underscore-prefixed args, so the cache is keyed on file_hash + suffix only.
+    """
+    return load_resume_bytes(_data, suffix)
+
+
 st.title("Resume Tailoring App")
 st.write("Upload your resume (PDF or DOCX) and paste the job description to get a tailored resume.")
 
@@ -17,13 +28,14 @@ if st.button("Generate Tailored Resume"):
     elif not job_desc_text.strip():
         st.error("Please enter a job description.")
     else:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(resume_file.name)[1]) as tmp:
-            tmp.write(resume_file.read())
-            tmp_path = tmp.name
+        data = resume_file.getvalue()
+        file_hash = hashlib.blake2b(data, digest_size=16).hexdigest()
+        suffix = os.path.splitext(resume_file.name)[1].lower()
 
         try:
             with st.spinner("Tailoring resume..."):
-                tailored_text = tailor_resume_file(tmp_path, job_desc_text)
+                resume_text = load_resume_cached(file_hash, suffix, data)
+                tailored_text = tailor_resume_text(resume_text, job_desc_text)
             st.success("Tailored resume generated!")
             st.text_area("Tailored Resume Output", value=tailored_text, height=400)
             st.download_button(
@@ -34,5 +46,3 @@ if st.button("Generate Tailored Resume"):
             )
         except Exception as e:
             st.error(f"Error tailoring resume: {e}")
-        finally:
-            os.remove(tmp_path)
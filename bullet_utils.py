@@ -1,14 +1,42 @@
+import functools
 import re
 
 # Extract and replace bullets in a given section
 
+_BULLET_MARKERS = ("-", "*", "\u2022")
+
+
+@functools.lru_cache(maxsize=32)
+def _section_pattern(section_name: str) -> re.Pattern:
+    """Compiled header/body pattern for a section, cached per section name."""
+    return re.compile(
+        rf"(?P<header>{re.escape(section_name)}\s*\n)(?P<body>.*?)(?=\n[A-Z][A-Z ]+\n|\Z)",
+        re.MULTILINE | re.IGNORECASE,
+    )
+
+
+def _find_header(resume: str, section_name: str) -> int:
+    """
+    Literal, case-insensitive probe for the section heading.
+    Returns -1 if the heading never appears, otherwise a safe start offset for the regex.
+    """
+    lowered = resume.lower()
+    idx = lowered.find(section_name.lower())
+    if idx > 0 and len(lowered) != len(resume):
+        # Lowercasing changed string length, so offsets don't map back; scan from the start
+        return 0
+    return idx
+
+
 def extract_section(resume: str, section_name: str) -> str:
     """
     Find the text under the given section heading (e.g., "Work Experience").
     Captures everything until the next all-caps-ish heading or end of document.
     """
-    pattern = rf"(?mi)(?P<header>{re.escape(section_name)}\s*\n)(?P<body>.*?)(?=\n[A-Z][A-Z ]+\n|\Z)"
-    match = re.search(pattern, resume)
+    start = _find_header(resume, section_name)
+    if start < 0:
+        return ""
+    match = _section_pattern(section_name).search(resume, start)
     return match.group("body") if match else ""
 
 #replace section
@@ -17,10 +45,17 @@ def replace_section(resume: str, section_name: str, new_body: str) -> str:
     Replace the entire body under section_name (including old bullets) with new_body.
     Keeps the section header intact.
     """
-    pattern = rf"(?mi)(?P<header>{re.escape(section_name)}\s*\n)(?P<body>.*?)(?=\n[A-Z][A-Z ]+\n|\Z)"
+    if _find_header(resume, section_name) < 0:
+        return resume
     def _repl(m):
         return m.group("header") + new_body
-    return re.sub(pattern, _repl, resume)
+    return _section_pattern(section_name).sub(_repl, resume)
+
+
+def _is_bullet_line(line: str) -> bool:
+    """True if the line is a bullet marker (after optional tabs/spaces) followed by whitespace."""
+    s = line.lstrip("\t ")
+    return s[:1] in _BULLET_MARKERS and s[1:2].isspace()
 
 
 def extract_bullets(section_text: str) -> list[str]:
@@ -28,7 +63,7 @@ def extract_bullets(section_text: str) -> list[str]:
     From a section’s raw text, collect all lines that look like bullet points.
     We accept lines starting with: - “- ” or “* ” or “• ” (possibly preceded by tabs/spaces).
     """
-    bullets = re.findall(r"^[\t ]*(?:[-\*\u2022])\s+.*", section_text, flags=re.MULTILINE)
+    bullets = [line for line in section_text.splitlines() if _is_bullet_line(line)]
     return bullets
 
 
@@ -41,7 +76,7 @@ def replace_bullets(section_text: str, new_bullets: list[str]) -> str:
     out_lines = []
     bi = 0
     for line in lines:
-        if re.match(r"^[\t ]*(?:[-\*\u2022])\s+.*", line):
+        if _is_bullet_line(line):
             if bi < len(new_bullets):
                 out_lines.append(new_bullets[bi])
                 bi += 1
@@ -1,39 +1,207 @@
+import functools
+import hashlib
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from diskcache import Cache
 from langchain.llms import Ollama
 from langchain.prompts import PromptTemplate
 
-# Initialize Ollama LLM
-llm = Ollama(model="llama3.2-3b")
+# Initialize Ollama LLM; pin the q4_K_M quantization explicitly rather than relying on an alias
+MODEL_NAME = os.environ.get("OLLAMA_MODEL", "llama3.2:3b-instruct-q4_K_M")
+
+# A rewritten bullet is a single short line, so cap generation per bullet;
+# "\nBullet:" stops the model from continuing the prompt's Bullet/Rewritten pattern
+BULLET_MAX_TOKENS = 80
+BULLET_STOP = ["\n\n", "\nBullet:"]
+
+# Context window allocated per request. Single bullets need well under 1024 tokens,
+# but a batched section plus its rewrites needs more; raise for very long job descriptions.
+NUM_CTX = int(os.environ.get("OLLAMA_NUM_CTX", "2048"))
+
+TEMPERATURE = 0.3
+
+llm = Ollama(model=MODEL_NAME, num_ctx=NUM_CTX, num_predict=BULLET_MAX_TOKENS, temperature=TEMPERATURE)
+
+# Persistent prompt/response cache; LLM_CACHE_TTL is in seconds (unset = never expire).
+# Bump CACHE_VERSION when prompts or response handling change in ways the key can't see.
+CACHE_VERSION = 1
+CACHE_DIR = os.environ.get("LLM_CACHE_DIR", "./.llm_cache")
+CACHE_TTL = float(os.environ["LLM_CACHE_TTL"]) if os.environ.get("LLM_CACHE_TTL") else None
+_disk_cache = Cache(CACHE_DIR)
+
+# Max concurrent requests to the Ollama server; keep low enough to fit in GPU memory
+OLLAMA_PARALLELISM = max(1, int(os.environ.get("OLLAMA_PARALLELISM", "4")))
+
+_BULLET_PREFIX = re.compile(r"^([\t ]*(?:[-\*\u2022])\s+)(.*)")
+_REWRITTEN_LABEL = re.compile(r"^Rewritten(?: Bullet Points?)?:\s*", re.IGNORECASE)
+_NUMBERED_ITEM = re.compile(r"^\s*(\d+)\.\s+", re.MULTILINE)
+
+
+def cached_prompt(fn):
+    """
+    Cache an LLM completion function on disk, keyed on the model, the wrapped
+    function, the generation options, any extra args (e.g. a token budget) and
+    the prompt. An in-process LRU sits in front of the on-disk cache, so repeat
+    prompts within one run never touch disk and repeats across runs skip the LLM.
+    """
+    options = repr((CACHE_VERSION, TEMPERATURE, NUM_CTX, BULLET_MAX_TOKENS, BULLET_STOP))
+    namespace = "\x00".join([MODEL_NAME, fn.__qualname__, options])
+
+    @functools.lru_cache(maxsize=1024)
+    def wrapper(prompt: str, *args) -> str:
+        key = hashlib.sha256("\x00".join([namespace, repr(args), prompt]).encode()).hexdigest()
+        cached = _disk_cache.get(key)
+        if cached is not None:
+            return cached
+        result = fn(prompt, *args)
+        _disk_cache.set(key, result, expire=CACHE_TTL)
+        return result
+    return functools.wraps(fn)(wrapper)
+
+
+# Shared instructions + job description come first so every call in a session
+# starts with the same prefix and Ollama can reuse its KV cache for it.
+_PROMPT_PREFIX = (
+    "You are a resume‐tailoring assistant. Rewrite the applicant’s bullet points so that they align more directly\n"
+    "with the job description’s language and requirements, without inventing any new experience or changing the\n"
+    "core meaning. Preserve the level of seniority and responsibilities exactly as written; only adjust phrasing\n"
+    "and keywords. Do not add new details.\n\n"
+    "Job Description:\n{job_description}\n"
+    "---\n"
+)
 
 prompt_template = PromptTemplate(
     input_variables=["job_description", "bullet"],
+    template=_PROMPT_PREFIX + "Bullet: {bullet}\nRewritten:"
+)
+
+batch_prompt_template = PromptTemplate(
+    input_variables=["job_description", "bullets", "count"],
     template=(
-        "You are a resume‐tailoring assistant. Given a job description and one of the applicant’s bullet points,\n"
-        "rewrite the bullet so that it aligns more directly with the job description’s language and requirements,\n"
-        "without inventing any new experience or changing the core meaning. Preserve the level of seniority and\n"
-        "responsibilities exactly as written; only adjust phrasing and keywords.\n\n"
-        "Job Description:\n{job_description}\n\n"
-        "Original Bullet Point:\n{bullet}\n\n"
-        "Rewritten Bullet Point (do not add new details):"
+        _PROMPT_PREFIX
+        + "Return exactly {count} lines, each prefixed by `<index>. ` and in the same order as below.\n"
+        + "Bullets:\n{bullets}Rewritten:"
     )
 )
 
 
+@cached_prompt
+def _complete(prompt: str, max_tokens: int) -> str:
+    return llm(prompt, num_predict=max_tokens)
+
+
+@cached_prompt
+def _complete_line(prompt: str) -> str:
+    """
+    Stream a completion and stop at the first newline once some text has been
+    produced; closing the stream early lets Ollama stop generating.
+    """
+    text = ""
+    for chunk in llm.stream(prompt, stop=BULLET_STOP, num_predict=BULLET_MAX_TOKENS):
+        text += chunk
+        line = _REWRITTEN_LABEL.sub("", text.lstrip()).lstrip()
+        if "\n" in line:
+            return line.split("\n", 1)[0]
+    return text
+
+
 def align_bullet(job_desc: str, bullet: str) -> str:
     prompt = prompt_template.format(job_description=job_desc, bullet=bullet)
-    rewritten = llm(prompt).strip()
-    rewritten = re.sub(r"(?i)^Rewritten Bullet Point:\s*", "", rewritten)
+    rewritten = _complete_line(prompt).strip()
+    rewritten = _REWRITTEN_LABEL.sub("", rewritten)
     return rewritten
 
 
-def align_bullets_to_job(job_desc: str, bullets: list[str]) -> list[str]:
-    aligned = []
+def _estimate_tokens(text: str) -> int:
+    """Rough token count (~4 chars per token) for budgeting prompts against NUM_CTX."""
+    return len(text) // 4 + 1
+
+
+def _batch_chunks(job_desc: str, bullets: list[str]) -> list[list[str]]:
+    """
+    Split bullets into runs whose batch prompt plus output budget fits in NUM_CTX.
+    Ollama silently drops the start of an overflowing prompt, which is where the
+    instructions and job description live, so long sections go out in several calls.
+    """
+    base = _estimate_tokens(batch_prompt_template.format(job_description=job_desc, bullets="", count=len(bullets)))
+    chunks, chunk, used = [], [], base
+    for b in bullets:
+        # "N. " prefix and newline, the bullet itself, and room for its rewrite
+        cost = _estimate_tokens(b) + 2 + BULLET_MAX_TOKENS
+        if chunk and used + cost > NUM_CTX:
+            chunks.append(chunk)
+            chunk, used = [], base
+        chunk.append(b)
+        used += cost
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def align_bullets_batch(job_desc: str, bullets: list[str]) -> list[str]:
+    """
+    Rewrite bullets with as few LLM calls as fit in the context window,
+    sending each run of bullets as one numbered list.
+    """
+    rewritten = []
+    for chunk in _batch_chunks(job_desc, bullets):
+        rewritten.extend(_align_batch_chunk(job_desc, chunk))
+    return rewritten
+
+
+def _align_batch_chunk(job_desc: str, bullets: list[str]) -> list[str]:
+    """
+    Rewrite a run of bullets in a single LLM call using a numbered list.
+    Only the first line of each numbered item is kept; any bullet whose line is
+    missing or empty in the response is rewritten on its own.
+    """
+    numbered = "".join(f"{i}. {b}\n" for i, b in enumerate(bullets, 1))
+    prompt = batch_prompt_template.format(job_description=job_desc, bullets=numbered, count=len(bullets))
+    response = _complete(prompt, BULLET_MAX_TOKENS * len(bullets)).strip()
+    response = _REWRITTEN_LABEL.sub("", response)
+
+    # Splitting on a capturing group yields [preamble, idx, text, idx, text, ...]
+    parts = _NUMBERED_ITEM.split(response)
+    by_index = {}
+    for idx, text in zip(parts[1::2], parts[2::2]):
+        # Only the item's own line counts; anything after it (e.g. closing chatter) is dropped
+        text = text.split("\n", 1)[0].strip()
+        if text:
+            by_index.setdefault(int(idx), text)
+
+    rewritten = [by_index.get(i) for i in range(1, len(bullets) + 1)]
+    missing = [i for i, r in enumerate(rewritten) if r is None]
+    for i, r in zip(missing, align_bullets_parallel(job_desc, [bullets[i] for i in missing])):
+        rewritten[i] = r
+    return rewritten
+
+
+def align_bullets_parallel(job_desc: str, bullets: list[str]) -> list[str]:
+    """
+    Rewrite each bullet with its own LLM call, running up to OLLAMA_PARALLELISM
+    requests concurrently. Output order matches input order.
+    """
+    if not bullets:
+        return []
+    with ThreadPoolExecutor(max_workers=min(OLLAMA_PARALLELISM, len(bullets))) as executor:
+        return list(executor.map(lambda b: align_bullet(job_desc, b), bullets))
+
+
+def align_bullets_to_job(job_desc: str, bullets: list[str], batch: bool = True) -> list[str]:
+    # Bullets repeated across roles are rewritten once and fanned back out
+    prefixes, slots = [], []
+    unique = {}
     for b in bullets:
-        m = re.match(r"^([\t ]*(?:[-\*\u2022])\s+)(.*)", b)
+        m = _BULLET_PREFIX.match(b)
         if m:
             prefix, core = m.group(1), m.group(2).strip()
         else:
             prefix, core = "- ", b.strip()
-        new_core = align_bullet(job_desc, core)
-        aligned.append(f"{prefix}{new_core}")
-    return aligned
\ No newline at end of file
+        prefixes.append(prefix)
+        slots.append(unique.setdefault(core.lower(), (len(unique), core))[0])
+    if not unique:
+        return []
+    unique_cores = [core for _, core in unique.values()]
+    new_cores = align_bullets_batch(job_desc, unique_cores) if batch else align_bullets_parallel(job_desc, unique_cores)
+    return [f"{prefix}{new_cores[slot]}" for prefix, slot in zip(prefixes, slots)]
\ No newline at end of file
@@ -1,6 +1,13 @@
+import io
+import mmap
 import os
 import docx2txt
-import PyPDF2
+from pypdf import PdfReader
+
+# Resumes are rarely longer than a few pages; stop extracting after this many
+MAX_PAGES = 5
+# Files at least this large are memory-mapped instead of read through Python buffers
+MMAP_THRESHOLD = 10 * 1024 * 1024
 
 # Load resume text from .pdf or .docx
 
@@ -17,13 +24,37 @@ def load_resume_text(file_path: str) -> str:
         raise ValueError(f"Unsupported resume format: {ext}. Please provide a .pdf or .docx file.")
 
 
-def _load_pdf_text(pdf_path: str) -> str:
-    """Extract text from each PDF page, concatenated with newline separators."""
-    text_pages = []
+def load_resume_bytes(data: bytes, ext: str) -> str:
+    """
+    Same as load_resume_text, but for an in-memory upload (e.g. from Streamlit).
+    ext is the file extension including the dot, e.g. ".pdf".
+    """
+    ext = ext.lower()
+    if ext == ".pdf":
+        return _extract_pdf_pages(PdfReader(io.BytesIO(data)), MAX_PAGES)
+    elif ext == ".docx":
+        # docx2txt opens its input with zipfile, which accepts file-like objects
+        return docx2txt.process(io.BytesIO(data))
+    else:
+        raise ValueError(f"Unsupported resume format: {ext}. Please provide a .pdf or .docx file.")
+
+
+def _load_pdf_text(pdf_path: str, max_pages: int = MAX_PAGES) -> str:
+    """Extract text from up to max_pages PDF pages, concatenated with newline separators."""
     with open(pdf_path, "rb") as f:
-        reader = PyPDF2.PdfReader(f)
-        for page in reader.pages:
-            text_pages.append(page.extract_text() or "")
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return _extract_pdf_pages(PdfReader(mm), max_pages)
+        return _extract_pdf_pages(PdfReader(f), max_pages)
+
+
+def _extract_pdf_pages(reader: PdfReader, max_pages: int) -> str:
+    """Pages are parsed lazily, so pages past max_pages are never touched."""
+    text_pages = []
+    for i, page in enumerate(reader.pages):
+        if i >= max_pages:
+            break
+        text_pages.append(page.extract_text() or "")
     return "\n".join(text_pages)
 
 
@@ -1,27 +1,43 @@
 #!/usr/bin/env python3
 """
 AI-Powered Resume Tailoring System
-Uses LangChain + Ollama (Llama 3.2 3b) to tailor resumes to job descriptions
+Uses the Ollama client (Llama 3.2 3b) to tailor resumes to job descriptions
 """
 
 import re
+import sys
 import json
 from typing import List, Dict, Tuple
-from dataclasses import dataclass
-from langchain.llms import Ollama
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
-from langchain.schema import BaseOutputParser
-from langchain.output_parsers import PydanticOutputParser
+import ollama
 from pydantic import BaseModel, Field
-import difflib
 from rich.console import Console
-from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
 import argparse
+from section_utils import extract_sections, extract_bullet_points, rebuild_sections
 
 console = Console()
 
+# Llama 3.2 3b with its q4_K_M quantization pinned explicitly (what the llama3.2:3b alias serves)
+DEFAULT_MODEL = "llama3.2:3b-instruct-q4_K_M"
+
+JSON_BLOCK = re.compile(r'\{.*\}', re.S)
+# Two consecutive blank lines separate the resume from the job description in piped input
+BLANK_LINE_PAIR = re.compile(r'\n[ \t]*\n[ \t]*(?:\n|$)')
+
+# Generation budgets: the analysis is a fixed-size object, improvements grow per bullet
+ANALYSIS_NUM_PREDICT = 512
+IMPROVEMENT_NUM_PREDICT_PER_BULLET = 120
+# Context window per request: must fit the whole resume plus the job description.
+# Kept explicit (not the server default) and fixed, since changing it reloads the model.
+NUM_CTX = 4096
+
+def parse_json_block(text: str) -> Dict:
+    """Extract and decode the outermost JSON object from a model response"""
+    match = JSON_BLOCK.search(text)
+    if not match:
+        raise ValueError("No JSON object found in model response")
+    return json.loads(match.group(0))
+
 # Pydantic models for structured output
 class BulletPointImprovement(BaseModel):
     original: str = Field(description="Original bullet point")
@@ -40,10 +56,12 @@ class ResumeAnalysis(BaseModel):
     recommendations: List[str] = Field(description="High-level recommendations for alignment")
 
 class AIResumeTailor:
-    def __init__(self, model_name: str = "llama3.2:3b"):
-        """Initialize the AI Resume Tailor with Ollama LLM"""
+    def __init__(self, model_name: str = DEFAULT_MODEL):
+        """Initialize the AI Resume Tailor with an Ollama client"""
+        self.model_name = model_name
+        self.client = ollama.Client()
         try:
-            self.llm = Ollama(model=model_name, temperature=0.3)
+            self.client.show(model_name)
             console.print(f"✅ Connected to Ollama model: {model_name}", style="green")
         except Exception as e:
             console.print(f"❌ Error connecting to Ollama: {e}", style="red")
@@ -51,15 +69,13 @@ class AIResumeTailor:
             console.print(f"  ollama pull {model_name}", style="yellow")
             raise
         
-        self.setup_chains()
+        self.setup_prompts()
     
-    def setup_chains(self):
-        """Setup LangChain chains for different tasks"""
+    def setup_prompts(self):
+        """Setup prompt templates for different tasks"""
         
-        # Chain for analyzing resume-job similarity
-        analysis_prompt = PromptTemplate(
-            input_variables=["resume", "job_description"],
-            template="""
+        # Prompt for analyzing resume-job similarity
+        self.analysis_prompt = """
             Analyze the similarity between this resume and job description. Be thorough and objective.
             
             RESUME:
@@ -78,12 +94,9 @@ class AIResumeTailor:
             
             Be precise and only include skills that are explicitly mentioned or clearly implied.
             """
-        )
         
-        # Chain for improving bullet points
-        improvement_prompt = PromptTemplate(
-            input_variables=["bullet_points", "job_description", "section_name"],
-            template="""
+        # Prompt for improving bullet points
+        self.improvement_prompt = """
             You are an expert resume writer. Improve these bullet points from the "{section_name}" section to better align with the job description. 
             
             IMPORTANT RULES:
@@ -114,91 +127,35 @@ class AIResumeTailor:
             
             Focus on making the bullet points more relevant while keeping them truthful.
             """
+    
+    def generate(self, prompt: str, num_predict: int) -> str:
+        """Run a single completion against Ollama and return the raw text"""
+        response = self.client.generate(
+            model=self.model_name,
+            prompt=prompt,
+            options={"temperature": 0.3, "num_predict": num_predict, "num_ctx": NUM_CTX}
         )
-        
-        self.analysis_chain = LLMChain(llm=self.llm, prompt=analysis_prompt)
-        self.improvement_chain = LLMChain(llm=self.llm, prompt=improvement_prompt)
+        return response["response"]
     
     def extract_sections(self, resume_text: str) -> Dict[str, Dict]:
         """Extract different sections from resume with their formatting"""
-        sections = {}
-        
-        # Common section patterns
-        section_patterns = [
-            r'(work experience|professional experience|employment|experience)',
-            r'(projects?|personal projects?|key projects?)',
-            r'(education|academic background)',
-            r'(skills?|technical skills?|core competencies)',
-            r'(achievements?|accomplishments?|awards?)'
-        ]
-        
-        current_section = None
-        current_content = []
-        lines = resume_text.split('\n')
-        
-        for i, line in enumerate(lines):
-            line_lower = line.lower().strip()
-            
-            # Check if line is a section header
-            is_section_header = False
-            for pattern in section_patterns:
-                if re.search(pattern, line_lower) and (len(line.strip()) < 50):
-                    is_section_header = True
-                    
-                    # Save previous section
-                    if current_section and current_content:
-                        sections[current_section] = {
-                            'content': '\n'.join(current_content),
-                            'start_line': len(sections) * 10,  # approximate
-                            'bullet_points': self.extract_bullet_points('\n'.join(current_content))
-                        }
-                    
-                    current_section = line.strip()
-                    current_content = []
-                    break
-            
-            if not is_section_header and current_section:
-                current_content.append(line)
-            elif not current_section:
-                # Content before first section (header info)
-                if 'header' not in sections:
-                    sections['header'] = {'content': '', 'bullet_points': []}
-                sections['header']['content'] += line + '\n'
-        
-        # Add the last section
-        if current_section and current_content:
-            sections[current_section] = {
-                'content': '\n'.join(current_content),
-                'start_line': len(sections) * 10,
-                'bullet_points': self.extract_bullet_points('\n'.join(current_content))
-            }
-        
-        return sections
+        return extract_sections(resume_text)
     
     def extract_bullet_points(self, text: str) -> List[str]:
         """Extract bullet points from a text section"""
-        bullet_points = []
-        lines = text.split('\n')
-        
-        for line in lines:
-            stripped = line.strip()
-            # Look for common bullet point indicators
-            if (stripped.startswith('•') or stripped.startswith('-') or 
-                stripped.startswith('*') or re.match(r'^\d+\.', stripped) or
-                (len(stripped) > 20 and any(word in stripped.lower() for word in 
-                ['developed', 'managed', 'led', 'created', 'implemented', 'designed', 'achieved']))):
-                bullet_points.append(stripped)
-        
-        return bullet_points
+        return extract_bullet_points(text)
     
     def analyze_resume_job_fit(self, resume: str, job_description: str) -> ResumeAnalysis:
         """Analyze how well the resume fits the job description"""
         console.print("🔍 Analyzing resume-job fit...", style="blue")
         
         try:
-            result = self.analysis_chain.run(resume=resume, job_description=job_description)
+            result = self.generate(
+                self.analysis_prompt.format(resume=resume, job_description=job_description),
+                ANALYSIS_NUM_PREDICT
+            )
             # Parse JSON response
-            analysis_data = json.loads(result)
+            analysis_data = parse_json_block(result)
             return ResumeAnalysis(**analysis_data)
         except Exception as e:
             console.print(f"⚠️ Analysis error: {e}", style="yellow")
@@ -221,13 +178,16 @@ class AIResumeTailor:
         bullets_text = '\n'.join([f"• {bp}" for bp in bullet_points])
         
         try:
-            result = self.improvement_chain.run(
-                bullet_points=bullets_text,
-                job_description=job_description,
-                section_name=section_name
+            result = self.generate(
+                self.improvement_prompt.format(
+                    bullet_points=bullets_text,
+                    job_description=job_description,
+                    section_name=section_name
+                ),
+                IMPROVEMENT_NUM_PREDICT_PER_BULLET * len(bullet_points)
             )
             
-            improvement_data = json.loads(result)
+            improvement_data = parse_json_block(result)
             return SectionImprovements(**improvement_data)
         except Exception as e:
             console.print(f"⚠️ Improvement error for {section_name}: {e}", style="yellow")
@@ -246,45 +206,11 @@ class AIResumeTailor:
         """Rebuild the resume with improvements while maintaining formatting"""
         console.print("🔧 Rebuilding resume with improvements...", style="blue")
         
-        # Start with original resume
-        rebuilt = original_resume
-        
-        # Replace improved bullet points section by section
-        for section_name, improvement in improvements.items():
-            if section_name not in sections:
-                continue
-                
-            section_content = sections[section_name]['content']
-            original_bullets = sections[section_name]['bullet_points']
-            
-            # Create mapping of original to improved bullets
-            for imp in improvement.improvements:
-                original_bullet = imp.original.lstrip('•-* ').strip()
-                improved_bullet = imp.improved
-                
-                # Find and replace in the section content
-                # Try multiple bullet point formats
-                patterns = [
-                    f"• {re.escape(original_bullet)}",
-                    f"- {re.escape(original_bullet)}",
-                    f"* {re.escape(original_bullet)}",
-                    re.escape(original_bullet)
-                ]
-                
-                for pattern in patterns:
-                    if re.search(pattern, section_content, re.IGNORECASE):
-                        section_content = re.sub(
-                            pattern, 
-                            f"• {improved_bullet}", 
-                            section_content, 
-                            flags=re.IGNORECASE
-                        )
-                        break
-            
-            # Replace the entire section in the rebuilt resume
-            rebuilt = rebuilt.replace(sections[section_name]['content'], section_content)
-        
-        return rebuilt
+        pairs = {
+            section_name: [(imp.original, imp.improved) for imp in improvement.improvements]
+            for section_name, improvement in improvements.items()
+        }
+        return rebuild_sections(original_resume, sections, pairs)
     
     def display_analysis(self, analysis: ResumeAnalysis):
         """Display the resume analysis in a formatted way"""
@@ -389,43 +315,24 @@ def get_user_input() -> Tuple[str, str]:
     console.print("🎯 AI-Powered Resume Tailoring System", style="bold blue")
     console.print("This tool will help align your resume to job descriptions using AI\n", style="blue")
     
-    # Get resume
-    console.print("📄 Please paste your resume text (press Enter twice when done):", style="green")
-    resume_lines = []
-    empty_line_count = 0
-    
-    while True:
-        line = input()
-        if line.strip() == "":
-            empty_line_count += 1
-            if empty_line_count >= 2:
-                break
-        else:
-            empty_line_count = 0
-        resume_lines.append(line)
-    
-    resume_text = '\n'.join(resume_lines).strip()
+    if not sys.stdin.isatty():
+        # Piped input is read in one go: resume, two blank lines, then the job description
+        parts = BLANK_LINE_PAIR.split(sys.stdin.read(), maxsplit=2)
+        resume_text = parts[0].strip()
+        job_description = parts[1].strip() if len(parts) > 1 else ""
+    else:
+        # Get resume
+        console.print("📄 Please paste your resume text, then press Ctrl-D on its own line to finish (Ctrl-Z then Enter on Windows):", style="green")
+        resume_text = sys.stdin.read().strip()
     
     if not resume_text:
         console.print("❌ No resume text provided. Exiting.", style="red")
         exit(1)
     
-    # Get job description  
-    console.print("\n💼 Please paste the job description (press Enter twice when done):", style="green")
-    job_lines = []
-    empty_line_count = 0
-    
-    while True:
-        line = input()
-        if line.strip() == "":
-            empty_line_count += 1
-            if empty_line_count >= 2:
-                break
-        else:
-            empty_line_count = 0
-        job_lines.append(line)
-    
-    job_description = '\n'.join(job_lines).strip()
+    if sys.stdin.isatty():
+        # Get job description  
+        console.print("\n💼 Please paste the job description, then press Ctrl-D on its own line to finish:", style="green")
+        job_description = sys.stdin.read().strip()
     
     if not job_description:
         console.print("❌ No job description provided. Exiting.", style="red")
@@ -451,7 +358,7 @@ def save_results(tailored_resume: str, analysis: ResumeAnalysis, filename: str =
 def main():
     """Main function"""
     parser = argparse.ArgumentParser(description="AI-Powered Resume Tailoring System")
-    parser.add_argument("--model", default="llama3.2:3b", help="Ollama model to use")
+    parser.add_argument("--model", default=DEFAULT_MODEL, help="Ollama model to use")
     parser.add_argument("--output", default="tailored_resume.txt", help="Output filename")
     args = parser.parse_args()
     
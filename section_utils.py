@@ -0,0 +1,156 @@
+"""
+Section extraction and rebuild helpers for the resume tailoring CLI.
+Pure text processing with no LLM, pydantic or rich dependencies.
+"""
+
+import re
+from typing import List, Dict, Tuple
+
+# Common section headers, matched against lowercased lines
+SECTION_HEADER = re.compile(
+    r'\b(work experience|professional experience|employment|experience'
+    r'|projects?|personal projects?|key projects?'
+    r'|education|academic background'
+    r'|skills?|technical skills?|core competencies'
+    r'|achievements?|accomplishments?|awards?)\b'
+)
+NUMBERED_LINE = re.compile(r'^\d+\.')
+BULLET_MARKERS = ('•', '-', '*')
+BULLET_STRIP = '•-* \t'
+
+def normalize_bullet(text: str) -> str:
+    """Strip bullet markers and case so bullets can be matched regardless of formatting"""
+    return text.lstrip(BULLET_STRIP).rstrip().lower()
+
+def extract_sections(resume_text: str) -> Dict[str, Dict]:
+    """Extract different sections from resume with their formatting"""
+    sections = {}
+
+    current_section = None
+    current_content = []
+    content_start = 0
+    offset = 0  # char offset of the current line in resume_text
+    header_buf: List[str] = []
+    lines = resume_text.split('\n')
+    # Lowercase once up front; header probes use lows, content keeps the original lines
+    lows = resume_text.lower().split('\n')
+
+    for line, low in zip(lines, lows):
+        line_lower = low.strip()
+
+        # Check if line is a section header
+        is_section_header = len(line.strip()) < 50 and SECTION_HEADER.search(line_lower) is not None
+        if is_section_header:
+            # Save previous section
+            if current_section and current_content:
+                body = '\n'.join(current_content)
+                sections[current_section] = {
+                    'content': body,
+                    'start_line': len(sections) * 10,  # approximate
+                    'start': content_start,
+                    'end': content_start + len(body),
+                    'bullet_points': extract_bullet_points(body)
+                }
+
+            current_section = line.strip()
+            current_content = []
+            content_start = offset + len(line) + 1
+
+        if not is_section_header and current_section:
+            current_content.append(line)
+        elif not current_section:
+            # Content before first section (header info)
+            if 'header' not in sections:
+                sections['header'] = {'content': '', 'bullet_points': []}
+            header_buf.append(line + '\n')
+
+        offset += len(line) + 1
+
+    if header_buf:
+        sections['header']['content'] = ''.join(header_buf)
+
+    # Add the last section
+    if current_section and current_content:
+        body = '\n'.join(current_content)
+        sections[current_section] = {
+            'content': body,
+            'start_line': len(sections) * 10,
+            'start': content_start,
+            'end': content_start + len(body),
+            'bullet_points': extract_bullet_points(body)
+        }
+
+    return sections
+
+def extract_bullet_points(text: str) -> List[str]:
+    """Extract bullet points from a text section"""
+    bullet_points = []
+    lines = text.split('\n')
+
+    for line in lines:
+        stripped = line.strip()
+        # Look for common bullet point indicators
+        if (stripped.startswith(BULLET_MARKERS) or NUMBERED_LINE.match(stripped) or
+            (len(stripped) > 20 and any(word in stripped.lower() for word in
+            ['developed', 'managed', 'led', 'created', 'implemented', 'designed', 'achieved']))):
+            bullet_points.append(stripped)
+
+    return bullet_points
+
+def rebuild_sections(original_resume: str, sections: Dict, improvements: Dict[str, List[Tuple[str, str]]]) -> str:
+    """
+    Rebuild the resume with improved bullets while maintaining formatting.
+    improvements maps a section name to (original, improved) bullet pairs.
+    """
+    # Start with original resume
+    rebuilt = original_resume
+    splices = []
+
+    # Replace improved bullet points section by section
+    for section_name, pairs in improvements.items():
+        if section_name not in sections:
+            continue
+
+        section_content = sections[section_name]['content']
+
+        # Map normalized original bullet text to its improved version
+        replacements = {}
+        originals = {}
+        for original, improved in pairs:
+            key = normalize_bullet(original)
+            if key:
+                replacements[key] = improved
+                originals[key] = original.lstrip(BULLET_STRIP).rstrip()
+
+        # Single pass over the section, swapping in improved bullets line by line
+        new_lines = []
+        matched = set()
+        for line in section_content.split('\n'):
+            key = normalize_bullet(line)
+            if key in replacements:
+                indent = line[:len(line) - len(line.lstrip())]
+                new_lines.append(f"{indent}• {replacements[key]}")
+                matched.add(key)
+            else:
+                new_lines.append(line)
+        section_content = '\n'.join(new_lines)
+
+        # Originals the model echoed back only partially (not a whole line) fall back
+        # to a substring match; subn matches and substitutes in a single pass
+        for key, improved_bullet in replacements.items():
+            if key in matched:
+                continue
+            pattern = re.compile(f"(?:[•*-] )?{re.escape(originals[key])}", re.IGNORECASE)
+            section_content, _ = pattern.subn(lambda m: f"• {improved_bullet}", section_content)
+
+        if 'start' in sections[section_name]:
+            splices.append((sections[section_name]['start'], sections[section_name]['end'], section_content))
+        else:
+            # No recorded offsets; fall back to replacing the section text
+            rebuilt = rebuilt.replace(sections[section_name]['content'], section_content)
+
+    # Splice rewritten sections in by offset, last first so earlier offsets stay valid
+    for start, end, section_content in sorted(splices, reverse=True):
+        rebuilt = rebuilt[:start] + section_content + rebuilt[end:]
+
+    return rebuilt
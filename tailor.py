@@ -5,6 +5,10 @@ from llm_utils import align_bullets_to_job
 
 def tailor_resume_file(resume_path: str, job_description: str) -> str:
     resume_text = load_resume_text(resume_path)
+    return tailor_resume_text(resume_text, job_description)
+
+
+def tailor_resume_text(resume_text: str, job_description: str) -> str:
     tailored = resume_text
 
     for section_name in ["Work Experience", "Projects"]: